@@ -0,0 +1,175 @@
+import os
+import sys
+import threading
+import traceback
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+from common_utils.logger import create_logger
+
+
+class SamplingProfiler:
+    """
+    Low-overhead sampling profiler that can be started and stopped while the app is running.
+
+    A daemon thread periodically samples the stacks of all other threads and aggregates them as
+    collapsed stacks (flamegraph.pl / speedscope compatible). Memory allocation tracing with
+    tracemalloc is toggled separately, as it is far more expensive than sampling. All reports are
+    written to the output directory.
+    """
+    log = create_logger("Profiler")
+
+    def __init__(self, output_dir: str, interval: float = 0.01, top_allocations: int = 25):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.top_allocations = top_allocations
+        self.stack_counts: Counter[str] = Counter()
+        self.sample_count = 0
+        self.running = False
+        self._started_tracemalloc = False
+        self._stop_event = threading.Event()
+        self._sampling_thread: threading.Thread | None = None
+
+    @property
+    def tracing_memory(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def toggle(self):
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def start(self):
+        """Start sampling the stacks of all threads."""
+        if self.running:
+            self.log.debug("Profiler is already running")
+            return
+        self.stack_counts.clear()
+        self.sample_count = 0
+        self._stop_event.clear()
+        self.running = True
+        self._sampling_thread = threading.Thread(target=self._sample_loop, name="Profiler",
+                                                 daemon=True)
+        self._sampling_thread.start()
+        self.log.info(f"Started sampling profiler (interval {self.interval}s)")
+
+    def stop(self):
+        """Stop sampling and write the collapsed stacks to disk."""
+        if not self.running:
+            self.log.debug("Profiler is not running")
+            return
+        self.running = False
+        self._stop_event.set()
+        if self._sampling_thread is not None:
+            self._sampling_thread.join()
+            self._sampling_thread = None
+        self.log.info(f"Stopped sampling profiler after {self.sample_count} samples")
+        self.write_collapsed_stacks()
+
+    def toggle_memory_tracing(self):
+        if self.tracing_memory:
+            self.stop_memory_tracing()
+        else:
+            self.start_memory_tracing()
+
+    def start_memory_tracing(self):
+        """Start tracing memory allocations (adds overhead to every allocation)."""
+        if self.tracing_memory:
+            self.log.debug("tracemalloc is already tracing")
+            return
+        tracemalloc.start()
+        self._started_tracemalloc = True
+        self.log.info("Started memory tracing")
+
+    def stop_memory_tracing(self):
+        """Write a final memory snapshot and stop tracemalloc, if it was started here."""
+        if not self._started_tracemalloc:
+            self.log.debug("Memory tracing was not started by the profiler")
+            return
+        try:
+            self.write_memory_snapshot()
+        finally:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+            self.log.info("Stopped memory tracing")
+
+    def _sample_loop(self):
+        own_thread_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            try:
+                self._take_sample(own_thread_id)
+            except Exception as e:
+                self.log.warning(f"Failed to take profiler sample: {e}")
+
+    def _take_sample(self, own_thread_id: int):
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread_id:
+                continue
+            thread_name = thread_names.get(thread_id, str(thread_id))
+            self.stack_counts[self._collapse_stack(thread_name, frame)] += 1
+        self.sample_count += 1
+
+    @staticmethod
+    def _collapse_stack(thread_name: str, frame) -> str:
+        """Build a 'thread;outer;...;inner' line from a frame, root first."""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            file_name = os.path.basename(code.co_filename)
+            stack.append(f"{code.co_name} ({file_name}:{frame.f_lineno})")
+            frame = frame.f_back
+        stack.append(thread_name)
+        return ";".join(reversed(stack))
+
+    def _output_path(self, name: str, extension: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        return os.path.join(self.output_dir, f"{name}_{timestamp}.{extension}")
+
+    def write_collapsed_stacks(self) -> str:
+        """Write the aggregated samples in collapsed stack format (load into speedscope.app)."""
+        path = self._output_path("profile", "folded")
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in self.stack_counts.most_common():
+                file.write(f"{stack} {count}\n")
+        self.log.info(f"Wrote collapsed stacks to {path}")
+        return path
+
+    def write_memory_snapshot(self) -> str | None:
+        """Write the top memory allocations of the current tracemalloc snapshot."""
+        if not tracemalloc.is_tracing():
+            self.log.warning("Can't take memory snapshot: tracemalloc is not tracing "
+                             "(start memory tracing first)")
+            return None
+        snapshot = tracemalloc.take_snapshot()
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        current, peak = tracemalloc.get_traced_memory()
+        path = self._output_path("memory", "txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(f"Traced memory: current {current / 1024:.1f} KiB, "
+                       f"peak {peak / 1024:.1f} KiB\n\n")
+            for stat in snapshot.statistics("lineno")[:self.top_allocations]:
+                file.write(f"{stat}\n")
+        self.log.info(f"Wrote memory snapshot to {path}")
+        return path
+
+    def write_thread_dump(self) -> str:
+        """Write the current stack of every running thread."""
+        path = self._output_path("threads", "txt")
+        frames = sys._current_frames()
+        threads = threading.enumerate()
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(f"{len(threads)} threads alive\n")
+            for thread in threads:
+                file.write(f"\nThread {thread.name} (id {thread.ident}, daemon={thread.daemon})\n")
+                frame = frames.get(thread.ident)
+                if frame is not None:
+                    file.write("".join(traceback.format_stack(frame)))
+        self.log.info(f"Wrote thread dump of {len(threads)} threads to {path}")
+        return path
@@ -0,0 +1,149 @@
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+
+from common_utils.logger import create_logger
+
+
+ROLLUP_TABLES = {
+    "daily": "%Y-%m-%d",
+    "weekly": "%G-W%V",
+    "monthly": "%Y-%m",
+}
+
+
+class WorkHistory:
+    """
+    Local SQLite store of the minutes worked per day, with weekly and monthly rollups.
+
+    Every write only touches one row per rollup table, so keeping the store in sync with the
+    timer is O(1) per tick. Queries are answered from the rollups without network access.
+    """
+    log = create_logger("Work History")
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._connection:
+            for table in ROLLUP_TABLES:
+                self._connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    f"(period TEXT PRIMARY KEY, minutes INTEGER NOT NULL)"
+                )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+        self.log.debug(f"Opened work history at {db_path}")
+
+    def set_time_worked(self, day: str, minutes: int):
+        """Set the minutes worked on a day (YYYY-MM-DD) and apply the difference to all rollups."""
+        with self._lock, self._connection:
+            self._apply_time_worked(day, minutes)
+
+    def import_missing_days(self, days: dict[str, int]) -> int:
+        """Add all days not yet stored locally in a single transaction and mark the import done.
+
+        Days that already exist locally are kept, as they may be ahead of the imported source.
+        Returns the number of imported days.
+        """
+        imported = 0
+        with self._lock, self._connection:
+            for day, minutes in days.items():
+                row = self._connection.execute(
+                    "SELECT 1 FROM daily WHERE period = ?", (day,)
+                ).fetchone()
+                if row is None:
+                    self._apply_time_worked(day, minutes)
+                    imported += 1
+            self._connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('history_imported', ?)",
+                (datetime.now().isoformat(),),
+            )
+        return imported
+
+    def has_imported_history(self) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM meta WHERE key = 'history_imported'"
+            ).fetchone()
+        return row is not None
+
+    def _apply_time_worked(self, day: str, minutes: int):
+        """Write a day and its rollup deltas; the caller holds the lock and the transaction."""
+        day_date = datetime.strptime(day, "%Y-%m-%d").date()
+        row = self._connection.execute(
+            "SELECT minutes FROM daily WHERE period = ?", (day,)
+        ).fetchone()
+        delta = minutes - (row[0] if row else 0)
+        if delta == 0:
+            return
+        for table, period_format in ROLLUP_TABLES.items():
+            self._connection.execute(
+                f"INSERT INTO {table} (period, minutes) VALUES (?, ?) "
+                f"ON CONFLICT(period) DO UPDATE SET minutes = minutes + excluded.minutes",
+                (day_date.strftime(period_format), delta),
+            )
+
+    def _get_minutes(self, table: str, day: date) -> int:
+        period = day.strftime(ROLLUP_TABLES[table])
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT minutes FROM {table} WHERE period = ?", (period,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def get_day_minutes(self, day: date | None = None) -> int:
+        return self._get_minutes("daily", day or date.today())
+
+    def get_week_minutes(self, day: date | None = None) -> int:
+        return self._get_minutes("weekly", day or date.today())
+
+    def get_month_minutes(self, day: date | None = None) -> int:
+        return self._get_minutes("monthly", day or date.today())
+
+    def get_year_minutes(self, year: int | None = None) -> int:
+        year = year or date.today().year
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COALESCE(SUM(minutes), 0) FROM monthly WHERE period LIKE ?", (f"{year}-%",)
+            ).fetchone()
+        return row[0]
+
+    def get_total_minutes(self) -> int:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COALESCE(SUM(minutes), 0) FROM monthly"
+            ).fetchone()
+        return row[0]
+
+    def get_streak(self, daily_goal: int, today: date | None = None) -> int:
+        """Count the consecutive days up to today on which the daily goal was reached.
+
+        Today only breaks the streak once it is over, so an unfinished day does not reset it.
+        Days are read newest first from the primary key index, stopping at the first gap.
+        """
+        today = today or date.today()
+        expected_day = today
+        streak = 0
+        with self._lock:
+            cursor = self._connection.execute(
+                "SELECT period FROM daily WHERE minutes >= ? AND period <= ? ORDER BY period DESC",
+                (daily_goal, today.strftime("%Y-%m-%d")),
+            )
+            for (period,) in cursor:
+                day = datetime.strptime(period, "%Y-%m-%d").date()
+                if streak == 0 and day == today - timedelta(days=1):
+                    expected_day = day
+                if day != expected_day:
+                    break
+                streak += 1
+                expected_day = day - timedelta(days=1)
+            cursor.close()
+        return streak
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
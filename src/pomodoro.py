@@ -12,6 +12,8 @@ from threading import Thread
 
 # local
 from src.systray.utils import draw_icon_text, draw_icon_circle
+from src.diagnostics.profiler import SamplingProfiler
+from src.history.work_history import WorkHistory
 from common_utils.config import CONFIG, secret, load_dotenv, ROOT_DIR
 from common_utils.logger import create_logger
 from common_utils.apis.firebase import FirebaseClient
@@ -140,6 +142,10 @@ class PomodoroApp:
         feature_settings = CONFIG["default_settings"]["features"]
         self.feature_handler = PomodoroFeatureHandler(settings=feature_settings,
                                                       firebase=self.firebase)
+        self.profiler = SamplingProfiler(output_dir=f"{os.getenv('APPDATA')}/Pomodoro")
+        self.work_history = self._open_work_history(
+            db_path=f"{os.getenv('APPDATA')}/Pomodoro/history.sqlite"
+        )
 
         # features data
         self.sound_files = {name: f"{ROOT_DIR}/{path}" for name, path in CONFIG["SOUNDS"].items()}
@@ -159,7 +165,9 @@ class PomodoroApp:
         self.daily_work_goal = self.settings["daily_work_time_goal"]
         self.current_timer_value = self.work_timer_duration
         self.current_date = datetime.now().strftime("%Y-%m-%d")
+        self._import_work_history_from_firebase()
         self.time_worked = self._load_time_worked_from_firebase()
+        self._update_work_history()
         self.update_habit_minutes = 15
 
 
@@ -211,10 +219,54 @@ class PomodoroApp:
             self.log.info(f"Loaded time_worked from firebase: {time_worked}")
         except Exception as e:
             self.log.info(f"Can't load {self.current_date}: time_worked from firebase, "
-                          f"setting to 0 instead (most likely a new day)")
-            time_worked = 0
+                          f"using local work history instead (most likely a new day)")
+            time_worked = self._load_time_worked_from_work_history()
         return time_worked
 
+    def _open_work_history(self, db_path: str) -> WorkHistory | None:
+        try:
+            return WorkHistory(db_path=db_path)
+        except Exception as e:
+            self.log.warning(f"Could not open local work history at {db_path}: {e}")
+            return None
+
+    def _import_work_history_from_firebase(self):
+        """Import all days stored in firebase once; retried on every start until it succeeds."""
+        try:
+            if self.work_history is None or self.work_history.has_imported_history():
+                return
+            entries = self.firebase.get_entry(ref=self.firebase_times_worked_ref)
+            assert isinstance(entries, dict)
+            days = {}
+            for day, entry in entries.items():
+                try:
+                    datetime.strptime(day, "%Y-%m-%d")
+                    days[day] = int(entry["time_worked"])
+                except Exception as e:
+                    self.log.debug(f"Skipping work history entry {day}: {entry} [{e}]")
+            imported = self.work_history.import_missing_days(days)
+            self.log.info(f"Imported work history of {imported} days from firebase")
+        except Exception as e:
+            self.log.warning(f"Can't import work history from firebase: [{e}]")
+
+    def _load_time_worked_from_work_history(self):
+        if self.work_history is None:
+            return 0
+        try:
+            return self.work_history.get_day_minutes()
+        except Exception as e:
+            self.log.warning(f"Can't load time_worked from local work history: {e}")
+            return 0
+
+    def _update_work_history(self):
+        """Sync the current day's time_worked into the local work history."""
+        if self.work_history is None:
+            return
+        try:
+            self.work_history.set_time_worked(day=self.current_date, minutes=self.time_worked)
+        except Exception as e:
+            self.log.warning(f"Could not update local work history: {e}")
+
     # BUILDING THE SYSTRAY MENU
     def update_menu(self):
         self.systray_app.menu = Menu(
@@ -238,6 +290,7 @@ class PomodoroApp:
         time_worked = self.time_worked / self.work_timer_duration
         return Menu(
             Item(text=f"Worked {time_worked:.1f} blocks", action=None),
+            Item("Statistics", self._get_statistics_menu()),
             Menu.SEPARATOR,
             self._get_settings_menu_change_timer_item(timer_name="WORK", sign='+'),
             self._get_settings_menu_change_timer_item(timer_name="WORK", sign='-'),
@@ -250,6 +303,7 @@ class PomodoroApp:
             self._get_settings_menu_feature_item(feature_name="Play Sound"),
             self._get_settings_menu_feature_item(feature_name="Habit Tracking"),
             Menu.SEPARATOR,
+            Item("Diagnostics", self._get_diagnostics_menu()),
             Item("Exit", self.menu_button_exit_app),
         )
 
@@ -267,6 +321,46 @@ class PomodoroApp:
             enabled=self.feature_handler.features[feature_name]["handler"] is not None,
         )
 
+    def _get_statistics_menu(self):
+        if self.work_history is None:
+            return Menu(Item(text="Statistics n/a", action=None))
+        try:
+            history = self.work_history
+            streak = history.get_streak(daily_goal=self.settings["daily_work_time_goal"])
+            return Menu(
+                Item(text=f"This week: {history.get_week_minutes() / 60:.1f}h", action=None),
+                Item(text=f"This month: {history.get_month_minutes() / 60:.1f}h", action=None),
+                Item(text=f"This year: {history.get_year_minutes() / 60:.1f}h", action=None),
+                Item(text=f"Total: {history.get_total_minutes() / 60:.1f}h", action=None),
+                Item(text=f"Streak: {streak} days", action=None),
+            )
+        except Exception as e:
+            self.log.warning(f"Can't load statistics from local work history: {e}")
+            return Menu(Item(text="Statistics n/a", action=None))
+
+    def _get_diagnostics_menu(self):
+        return Menu(
+            Item(
+                text="Sampling Profiler",
+                action=lambda: self.menu_button_diagnostics(self.profiler.toggle),
+                checked=lambda item: self.profiler.running,
+            ),
+            Item(
+                text="Trace Memory",
+                action=lambda: self.menu_button_diagnostics(self.profiler.toggle_memory_tracing),
+                checked=lambda item: self.profiler.tracing_memory,
+            ),
+            Item(
+                text="Memory Snapshot",
+                action=lambda: self.menu_button_diagnostics(self.profiler.write_memory_snapshot),
+                enabled=lambda item: self.profiler.tracing_memory,
+            ),
+            Item(
+                text="Thread Dump",
+                action=lambda: self.menu_button_diagnostics(self.profiler.write_thread_dump),
+            ),
+        )
+
     def update_display(self):
         with self.thread_lock:
             self.update_menu()
@@ -302,11 +396,32 @@ class PomodoroApp:
                 data=self.pause_timer_duration
             )
 
+    def menu_button_diagnostics(self, action):
+        """Run a diagnostics action and rebuild the menu to reflect the new profiler state."""
+        try:
+            action()
+        except Exception as e:
+            self.log.warning(f"Diagnostics action {action.__name__} failed: {e}")
+        self.update_display()
+
     def menu_button_exit_app(self):
         """ Function that is called when the exit button is pressed. Sets thread stop flag """
         self.log.info("Exiting Pomodoro Timer - setting stop_timer_thread_flag and stopping app")
         self.stop_timer_thread_flag = True
+        try:
+            self.profiler.stop()
+        except Exception as e:
+            self.log.warning(f"Could not stop profiler cleanly: {e}")
+        try:
+            self.profiler.stop_memory_tracing()
+        except Exception as e:
+            self.log.warning(f"Could not stop memory tracing cleanly: {e}")
         sleep(0.11)
+        try:
+            if self.work_history is not None:
+                self.work_history.close()
+        except Exception as e:
+            self.log.warning(f"Could not close local work history: {e}")
         self.exited_flag = True
         self.systray_app.stop()
 
@@ -380,6 +495,7 @@ class PomodoroApp:
         else:
             self.time_worked += 1
         time_worked_ref = f"{self.firebase_times_worked_ref}/{current_date}"
+        self._update_work_history()
         self.firebase.update_value(ref=time_worked_ref, key="time_worked", value=self.time_worked)
         if self.time_worked % self.update_habit_minutes == 0:
             date_stamp = datetime.now().strftime("%Y%m%d")
@@ -0,0 +1,81 @@
+import sys
+import threading
+import tracemalloc
+from time import sleep
+
+import pytest
+
+from src.diagnostics.profiler import SamplingProfiler
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    sampling_profiler = SamplingProfiler(output_dir=str(tmp_path / "Pomodoro"), interval=0.005)
+    yield sampling_profiler
+    sampling_profiler.stop()
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def _inner_frame():
+    return sys._getframe()
+
+
+def _outer_frame():
+    return _inner_frame()
+
+
+def test_collapse_stack_is_root_first(profiler):
+    line = SamplingProfiler._collapse_stack("Worker", _outer_frame())
+
+    names = [entry.split(" (")[0] for entry in line.split(";")]
+    assert names[0] == "Worker"
+    assert names[-2:] == ["_outer_frame", "_inner_frame"]
+
+
+def test_stop_writes_collapsed_stacks(profiler, tmp_path):
+    profiler.start()
+    assert profiler.running
+    sleep(0.1)
+    profiler.stop()
+
+    assert not profiler.running
+    assert profiler.sample_count > 0
+    folded_files = list((tmp_path / "Pomodoro").glob("profile_*.folded"))
+    assert len(folded_files) == 1
+    lines = folded_files[0].read_text(encoding="utf-8").splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("MainThread;")
+        assert int(count) > 0
+
+
+def test_memory_snapshot_requires_tracing(profiler, tmp_path):
+    assert profiler.write_memory_snapshot() is None
+
+    profiler.start_memory_tracing()
+    assert profiler.tracing_memory
+    path = profiler.write_memory_snapshot()
+
+    assert path is not None
+    assert "Traced memory" in open(path, encoding="utf-8").read()
+    profiler.stop_memory_tracing()
+    assert not tracemalloc.is_tracing()
+
+
+def test_stop_memory_tracing_keeps_external_tracemalloc(profiler):
+    tracemalloc.start()
+    profiler.start_memory_tracing()
+    profiler.stop_memory_tracing()
+
+    assert tracemalloc.is_tracing()
+
+
+def test_thread_dump_lists_current_thread(profiler):
+    path = profiler.write_thread_dump()
+
+    content = open(path, encoding="utf-8").read()
+    current_thread = threading.current_thread()
+    assert f"Thread {current_thread.name} (id {current_thread.ident}" in content
+    assert "test_thread_dump_lists_current_thread" in content
@@ -0,0 +1,92 @@
+from datetime import date
+
+import pytest
+
+from src.history.work_history import WorkHistory
+
+
+@pytest.fixture
+def history(tmp_path):
+    work_history = WorkHistory(db_path=str(tmp_path / "Pomodoro" / "history.sqlite"))
+    yield work_history
+    work_history.close()
+
+
+def test_set_time_worked_updates_all_rollups(history):
+    history.set_time_worked(day="2026-03-02", minutes=30)
+    history.set_time_worked(day="2026-03-02", minutes=45)
+    history.set_time_worked(day="2026-03-03", minutes=60)
+
+    assert history.get_day_minutes(date(2026, 3, 2)) == 45
+    assert history.get_week_minutes(date(2026, 3, 2)) == 105
+    assert history.get_month_minutes(date(2026, 3, 2)) == 105
+    assert history.get_year_minutes(2026) == 105
+    assert history.get_total_minutes() == 105
+
+
+def test_set_time_worked_applies_negative_delta(history):
+    history.set_time_worked(day="2026-03-02", minutes=90)
+    history.set_time_worked(day="2026-03-02", minutes=20)
+
+    assert history.get_day_minutes(date(2026, 3, 2)) == 20
+    assert history.get_week_minutes(date(2026, 3, 2)) == 20
+    assert history.get_month_minutes(date(2026, 3, 2)) == 20
+    assert history.get_total_minutes() == 20
+
+
+def test_iso_week_spans_year_boundary(history):
+    # 2026-12-31 and 2027-01-01 both belong to ISO week 2026-W53
+    history.set_time_worked(day="2026-12-31", minutes=30)
+    history.set_time_worked(day="2027-01-01", minutes=40)
+
+    assert history.get_week_minutes(date(2026, 12, 31)) == 70
+    assert history.get_week_minutes(date(2027, 1, 1)) == 70
+    assert history.get_month_minutes(date(2026, 12, 31)) == 30
+    assert history.get_month_minutes(date(2027, 1, 1)) == 40
+    assert history.get_year_minutes(2026) == 30
+    assert history.get_year_minutes(2027) == 40
+
+
+def test_import_missing_days_marks_history_imported(history):
+    assert not history.has_imported_history()
+
+    imported = history.import_missing_days({"2025-12-30": 120, "2026-01-02": 60})
+
+    assert imported == 2
+    assert history.has_imported_history()
+    assert history.get_total_minutes() == 180
+    assert history.get_year_minutes(2025) == 120
+
+
+def test_import_into_non_empty_store_keeps_local_days(history):
+    # the first tick after an offline start writes today before the import ever succeeded
+    history.set_time_worked(day="2026-03-02", minutes=15)
+    assert not history.has_imported_history()
+
+    imported = history.import_missing_days({"2026-03-01": 240, "2026-03-02": 10})
+
+    assert imported == 1
+    assert history.has_imported_history()
+    assert history.get_day_minutes(date(2026, 3, 2)) == 15
+    assert history.get_week_minutes(date(2026, 3, 2)) == 15
+    assert history.get_month_minutes(date(2026, 3, 2)) == 255
+
+
+def test_streak_ignores_unfinished_today(history):
+    for day in ["2026-03-01", "2026-03-02", "2026-03-03"]:
+        history.set_time_worked(day=day, minutes=240)
+    history.set_time_worked(day="2026-03-04", minutes=60)
+
+    assert history.get_streak(daily_goal=240, today=date(2026, 3, 4)) == 3
+
+    history.set_time_worked(day="2026-03-04", minutes=240)
+    assert history.get_streak(daily_goal=240, today=date(2026, 3, 4)) == 4
+
+
+def test_streak_stops_at_gap(history):
+    for day in ["2026-02-26", "2026-02-27", "2026-03-01", "2026-03-02"]:
+        history.set_time_worked(day=day, minutes=240)
+    history.set_time_worked(day="2026-02-28", minutes=100)
+
+    assert history.get_streak(daily_goal=240, today=date(2026, 3, 2)) == 2
+    assert history.get_streak(daily_goal=240, today=date(2026, 3, 4)) == 0